@@ -11,10 +11,135 @@ description:
   "Node" and these nodes are linked together. 
 """
 
-from time import time
-from inspect import signature
+from time import perf_counter_ns
+from collections import OrderedDict
+from uuid import uuid4
+from types import FunctionType
+from weakref import WeakValueDictionary
+import logging
 from .flow_exceptions import FlowExitChart, FlowExit
 
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    from numba.core.errors import TypingError
+except ImportError:
+    njit = None
+
+class _JitAction:
+    """Wrapper which calls a numba compiled version of a node action. If
+    numba is unable to compile the function for the given state, the
+    original python function is used from then on. If a signature is
+    given the function is compiled immediately, rather than on the
+    first call.
+
+    """
+
+    __slots__ = ("func", "signature", "compiled")
+
+    def __init__(self, func, signature=None):
+        self.func = func
+        self.signature = signature
+        try:
+            if signature is None:
+                self.compiled = njit(cache=True)(func)
+            else:
+                self.compiled = njit(signature, cache=True)(func)
+        except Exception:
+            logger.warning(f"numba could not compile {func.__name__}, falling back to python")
+            self.compiled = None
+
+    def __call__(self, state):
+        if self.compiled is None:
+            return self.func(state)
+        try:
+            return self.compiled(state)
+        except TypingError:
+            logger.warning(f"numba could not compile {self.func.__name__}, falling back to python")
+            self.compiled = None
+            return self.func(state)
+
+    def __getstate__(self):
+        return self.func, self.signature
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+def jit_action(func, signature=None):
+    """Compile a node action with numba (if it is installed), falling
+    back on the plain python function when numba is unavailable or
+    cannot compile it.
+
+    Arguments
+    -----------------
+    func: function
+      function object of the form: func(state) returns state. Other
+      callables (methods, partials, callable objects) are returned
+      unchanged since numba can only compile plain functions.
+
+    signature: numba signature
+      signature for the state, e.g. "float64[:](float64[:])". When
+      given the action is compiled right away instead of on its first
+      call, keeping the compile time out of the first run of the
+      chart.
+
+      :default:
+        None
+    """
+    if njit is None:
+        logger.warning("numba is not installed, node actions will not be compiled")
+        return func
+    if isinstance(func, _JitAction):
+        if signature is None or func.signature == signature:
+            return func
+        func = func.func
+    if not isinstance(func, FunctionType):
+        logger.warning(f"{func!r} is not a plain function, it will not be compiled")
+        return func
+    return _JitAction(func, signature)
+
+# caches are only referenced weakly here, so a cache is dropped along
+# with the last node (or copy of it) which uses it
+_memo_caches = WeakValueDictionary()
+
+class _Memo:
+    """Cache for the results of running a node, keyed by key_fn(state),
+    dropping the least recently used result once more than maxsize
+    are stored. The cache is looked up by a token, so copies of the
+    node in the same process (i.e. those made by a Pipe for each
+    state) share it.
+
+    """
+
+    __slots__ = ("key_fn", "maxsize", "token", "cache")
+
+    def __init__(self, key_fn, maxsize, token=None):
+        self.key_fn = key_fn
+        self.maxsize = maxsize
+        self.token = uuid4().hex if token is None else token
+        self.cache = _memo_caches.get(self.token)
+        if self.cache is None:
+            self.cache = OrderedDict()
+            _memo_caches[self.token] = self.cache
+
+    def __call__(self, node, state):
+        key = self.key_fn(state)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        res = node._run(state)
+        self.cache[key] = res
+        if len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+        return res
+
+    def __getstate__(self):
+        return self.key_fn, self.maxsize, self.token
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
 class Node:
     """Base object for all nodes in the flowchart
 
@@ -33,9 +158,60 @@ class Node:
       name of the node, should be unique in the flowchart. This is how
       other nodes (i.e. decision nodes) will identify the node.
 
+    action: function
+      function object of the form: action(state) returns state. This
+      defines the behaviour of the node, subclasses may instead
+      override the "action" method.
+
+      :default:
+        passes the state along unchanged
+
+    jit: bool
+      If True the action is compiled with numba (when installed) the
+      first time it is called, falling back on python if numba is
+      unable to compile it. Only useful for actions which numba can
+      handle, e.g. those working on numpy arrays.
+
+      :default:
+        False
+
+    jit_signature: numba signature
+      signature for the action when jit is True, so that it is
+      compiled when the node is created rather than on its first
+      call. See jit_action.
+
+      :default:
+        None
+
+    resource: string
+      tag for a limited resource used by the node (e.g. "gpu"). A Pipe
+      given a limit for this tag will ensure that no more than that
+      many nodes with the tag run at once across its worker processes.
+      Ignored on nodes which contain other nodes (Chart, Pipe).
+
+      :default:
+        None
+
+    Nodes use __slots__ to keep them small and fast to access, a
+    subclass which needs extra attributes should declare its own
+    __slots__ (or omit it to fall back on a regular __dict__).
+
+    Timing each call adds overhead which can dominate for cheap nodes,
+    so it is disabled by default. Set the class attribute
+    "enable_benchmark" to True (e.g. flow.Node.enable_benchmark = True)
+    to record the run time of each call, in nanoseconds, in the
+    "benchmark" attribute.
+
     """
 
+    __slots__ = ("name", "owner", "forward", "reverse", "benchmark", "visual_kwargs", "_action", "resource", "_memo")
+
     node_state = {}
+    enable_benchmark = False
+    # all_subclasses results, cleared whenever a new subclass is defined
+    _subclass_cache = {}
+    # (name, descriptor) pairs for the slots of each class
+    _slot_cache = {}
     
     def __init__(self, **kwargs):
         if "name" in kwargs: self.name = kwargs["name"]
@@ -43,17 +219,21 @@ class Node:
         
         self.owner = None
         self.forward = []
-        self.reverse = set()
+        self.reverse = []
         self.benchmark = -1
+        self.resource = kwargs.get("resource", None)
+        self._memo = None
         self.visual_kwargs = {'color': "black",
                               'shape': 'plain',
                               'style': 'solid'}
-        if "action" in kwargs:
-            self.action = kwargs["action"]
+        self._action = kwargs.get("action", None)
+        if self._action is not None and kwargs.get("jit", False):
+            self._action = jit_action(self._action, kwargs.get("jit_signature", None))
 
     def action(self, state):
         """Placeholder function which defines the primary behaviour of the
-        node.
+        node. Calls the action given when the node was created, or
+        simply passes the state along if there is none.
 
         Arguments
         -----------------
@@ -62,8 +242,127 @@ class Node:
           analysis task.
 
         """
+        if self._action is None:
+            return state
+        return self._action(state)
+
+    @classmethod
+    def _slot_descriptors(cls):
+        descriptors = Node._slot_cache.get(cls)
+        if descriptors is None:
+            descriptors = []
+            for klass in cls.__mro__:
+                slots = klass.__dict__.get("__slots__", ())
+                if isinstance(slots, str):
+                    slots = (slots,)
+                for name in slots:
+                    if name not in ("__dict__", "__weakref__"):
+                        descriptors.append((name, klass.__dict__[name]))
+            Node._slot_cache[cls] = descriptors
+        return descriptors
+
+    def __getstate__(self):
+        """Collect the attributes of the node for pickling and copying.
+        Slots are read through their descriptors, skipping any which
+        have not been set.
+
+        """
+        state = dict(getattr(self, "__dict__", {}))
+        for name, descriptor in self._slot_descriptors():
+            try:
+                state[name] = descriptor.__get__(self)
+            except AttributeError:
+                pass
+        if self.owner is not None:
+            # the reverse links are rebuilt from the structure_dict of
+            # the owner, no need to store every edge twice
+            state.pop("reverse", None)
         return state
 
+    def __setstate__(self, state):
+        state = dict(state)
+        for name, descriptor in self._slot_descriptors():
+            if name in state:
+                descriptor.__set__(self, state.pop(name))
+        if state:
+            self.__dict__.update(state)
+        if not hasattr(self, "reverse"):
+            self.reverse = []
+            # an owner which is still being restored (i.e. unpickling a
+            # whole Chart) links its nodes once it is complete, but a
+            # copy of a single node is owned by a finished flowchart
+            links = getattr(self.owner, "structure_dict", None)
+            nodes = getattr(self.owner, "nodes", None)
+            if links is not None and nodes is not None:
+                for name, names in links.items():
+                    if self.name in names:
+                        self.reverse.append(nodes[name])
+
+    def memoize(self, key_fn, maxsize=128):
+        """Cache the results of this node. Before running the node,
+        key_fn(state) is computed and if the same key has been seen
+        before the stored result is returned instead. This is only
+        correct for nodes whose result depends solely on the key, and
+        which return a new object rather than modifying the state in
+        place (a cached state object would otherwise be handed to
+        later runs). Useful when many states share the same inputs for
+        the early parts of a flowchart. Works for any node, for a Chart
+        or Pipe the whole sub-flowchart is skipped on a cache hit (and
+        so it records no path for that run).
+
+        Arguments
+        -----------------
+        key_fn: function
+          function of the form: key_fn(state) returns a hashable key
+          identifying the parts of the state used by the action. It is
+          sent to the worker processes along with the node when run by
+          a Pipe in parallelize mode, so it must then be picklable
+          (i.e. a module level function, not a lambda).
+
+        maxsize: int
+          maximum number of results to keep, the least recently used
+          is dropped first.
+
+          :default:
+            128
+        """
+        self._memo = _Memo(key_fn, maxsize)
+
+    def reset(self):
+        """Clear the values left over from running the node, so that it
+        can be run on a new state as if freshly built.
+
+        """
+        self.benchmark = -1
+
+    def clone(self):
+        """Lightweight copy of the node for running on a new state.
+
+        The copy shares its action and any other attributes with the
+        original, only the values which change while running are
+        reset. Links to other nodes are left empty, the Chart which
+        owns the node is responsible for linking its clones. This is
+        much cheaper than a deepcopy, but node actions must not rely
+        on mutable objects shared between runs. A subclass which keeps
+        such values should override this method (calling super) to
+        give the copy its own.
+
+        """
+        cls = type(self)
+        new = cls.__new__(cls)
+        for name, descriptor in cls._slot_descriptors():
+            try:
+                descriptor.__set__(new, descriptor.__get__(self))
+            except AttributeError:
+                pass
+        if hasattr(self, "__dict__"):
+            new.__dict__.update(self.__dict__)
+        new.owner = None
+        new.forward = []
+        new.reverse = []
+        new.benchmark = -1
+        return new
+
     def set_owner(self, node):
         """Pointer to the object which contains this node.
 
@@ -76,12 +375,19 @@ class Node:
         """
         self.owner = node
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Node._subclass_cache.clear()
+
     @classmethod
     def all_subclasses(cls):
-        subclasses = {}
-        for subclass in cls.__subclasses__():
-            subclasses[subclass.__name__] = subclass
-            subclasses.update(subclass.all_subclasses())
+        subclasses = Node._subclass_cache.get(cls)
+        if subclasses is None:
+            subclasses = {}
+            for subclass in cls.__subclasses__():
+                subclasses[subclass.__name__] = subclass
+                subclasses.update(subclass.all_subclasses())
+            Node._subclass_cache[cls] = subclasses
         return subclasses
         
     
@@ -115,7 +421,7 @@ class Node:
           flowchart.
 
         """
-        self.forward.pop(self.forward.index(node))
+        self.forward.remove(node)
         node.unlink_reverse(self)
 
     def link_reverse(self, node):
@@ -132,7 +438,8 @@ class Node:
           flowchart.
 
         """
-        self.reverse.update([node])
+        if node not in self.reverse:
+            self.reverse.append(node)
 
     def unlink_reverse(self, node):
         """Undo the operations of the "link_reverse" method. Returns the
@@ -154,7 +461,9 @@ class Node:
         raise FlowExit(msg)
 
     def _run(self, state):
-        """Wrapper function for node specific action function.
+        """Wrapper function for node specific action function. An action
+        given when the node was created is used in place of the
+        "action" method.
 
         Arguments
         -----------------
@@ -163,12 +472,16 @@ class Node:
           analysis task.
 
         """
-        return self.action(state)
+        if self._action is None:
+            return self.action(state)
+        return self._action(state)
 
     def __call__(self, state):
-        start = time()
-        res = self._run(state)
-        self.benchmark = time() - start
+        if not self.enable_benchmark:
+            return self._run(state) if self._memo is None else self._memo(self, state)
+        start = perf_counter_ns()
+        res = self._run(state) if self._memo is None else self._memo(self, state)
+        self.benchmark = perf_counter_ns() - start
         return res
 
     def next(self):
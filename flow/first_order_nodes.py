@@ -15,8 +15,7 @@ description:
   the full flowchart is built.
 """
 
-from time import time
-from inspect import signature
+from time import perf_counter_ns
 from .core import Node
 
 
@@ -30,6 +29,8 @@ class Start(Node):
     initialization takes no arguments.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
         self.visual_kwargs['color'] = "blue"
@@ -48,6 +49,8 @@ class End(Node):
     flowchart. It's initialization takes no arguments.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
         self.visual_kwargs['color'] = "red"
@@ -69,7 +72,7 @@ class End(Node):
         raise AttributeError("'end' object has no method 'unlink_forward'")
 
     def next(self):
-        raise StopIteration()
+        return None
 
 
 class Process(Node):
@@ -96,6 +99,8 @@ class Process(Node):
         None
     """
 
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.visual_kwargs['shape'] = "box"
@@ -112,6 +117,11 @@ class Decision(Node):
     create loops which iteratively perform some analysis. Visually
     represented as a diamond shape.
 
+    The action returns the name, Node object, or position of the
+    linked node to go to next. A name (or Node) which is not linked
+    from the decision raises a ValueError, other results leave the
+    previous choice in place.
+
     Arguments
     -----------------
     name: string
@@ -128,24 +138,68 @@ class Decision(Node):
         None
     """
 
+    __slots__ = ("next_index", "forward_index")
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.visual_kwargs['shape'] = "diamond"
         self.next_index = 0
+        self.forward_index = {}
 
     def __call__(self, state):
-        start = time()
-        res = self._run(state)
-        if isinstance(res,int) and 0 <= res < len(self.forward):
-            self.next_index = res
-        elif isinstance(res, str) and res != self.forward[0].name:
-            names = list(F.name for F in self.forward)
-            self.next_index = names.index(res)
-        elif isinstance(res, Node) and res is not self.forward[0]:
-            names = list(F.name for F in self.forward)
-            self.next_index = names.index(res.name)
-        self.benchmark = time() - start
+        if self.enable_benchmark:
+            start = perf_counter_ns()
+        res = self._run(state) if self._memo is None else self._memo(self, state)
+        try:
+            if isinstance(res, str):
+                self.next_index = self.forward_index[res]
+            elif isinstance(res, int) and 0 <= res < len(self.forward):
+                self.next_index = res
+            elif isinstance(res, Node):
+                self.next_index = self.forward_index[res.name]
+        except KeyError:
+            raise ValueError(f"{self.name} is not linked to {res}") from None
+        if self.enable_benchmark:
+            self.benchmark = perf_counter_ns() - start
         return state
 
+    def reset(self):
+        super().reset()
+        self.next_index = 0
+
+    def clone(self):
+        new = super().clone()
+        new.next_index = 0
+        new.forward_index = {}
+        return new
+
+    def link_forward(self, node):
+        """Extend the default "link_forward" method. Also records the
+        position of the node so that the result of the decision can be
+        looked up directly by name.
+
+        Arguments
+        -----------------
+        node: Node
+          A Node object to be linked as a possible next step in the
+          flowchart.
+
+        """
+        super().link_forward(node)
+        self.forward_index.setdefault(node.name, len(self.forward) - 1)
+
+    def unlink_forward(self, node):
+        """Extend the default "unlink_forward" method. Removing a link
+        shifts the positions of the remaining links, so the stored
+        choice is reset to the first link rather than left pointing at
+        the wrong node (or past the end of the list).
+
+        """
+        super().unlink_forward(node)
+        self.next_index = 0
+        self.forward_index = {}
+        for i, F in enumerate(self.forward):
+            self.forward_index.setdefault(F.name, i)
+
     def next(self):
         return self.forward[self.next_index]
@@ -13,17 +13,62 @@ description:
   nodes or flowcharts.
 """
 
-import pygraphviz as pgv
-from multiprocessing import Pool
-from copy import deepcopy
-from .core import Node
-from .first_order_nodes import Start, End
-from .flow_exceptions import FlowExitChart, FlowExit
+import os
+import weakref
+from multiprocessing import Pool, Semaphore
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import pickle
+from .core import Node, jit_action
+from .first_order_nodes import Start, End, Process
+from .flow_exceptions import FlowExitChart, FlowExit, FlowLinkError
 from datetime import datetime
-from time import time
+from time import time, perf_counter_ns
 import traceback
 import logging
 
+logger = logging.getLogger(__name__)
+
+_worker_pipe = None
+_resource_semaphores = {}
+
+def _init_worker(pipe_bytes, semaphores):
+    """Store the Pipe once per worker process so that individual tasks
+    only need to send the state across the process boundary. Also
+    installs the semaphores shared between workers for limited
+    resources. The Pipe arrives pickled so that the pool does not
+    hold a reference to the original Pipe.
+
+    """
+    global _worker_pipe
+    _worker_pipe = pickle.loads(pipe_bytes)
+    _resource_semaphores.update(semaphores)
+
+def _apply_chart_worker(state):
+    return _worker_pipe.apply_chart(state)
+
+def _normalize_structure(structure):
+    """Convert a structure given to "Chart.build_chart" into a list of
+    (node1, node2) links. In a list, consecutive names are linked
+    and a tuple (name, [names]) links its name to each of the listed
+    names. In a dict each key is linked to its value(s).
+
+    """
+    if not isinstance(structure, list):
+        return list(
+            (node1, node2)
+            for node1, links in structure.items()
+            for node2 in ((links,) if isinstance(links, str) else links)
+        )
+    edges = []
+    for node, next_node in zip(structure, structure[1:] + [None]):
+        if isinstance(node, tuple):
+            edges.extend((node[0], node2) for node2 in node[1])
+        elif isinstance(next_node, str):
+            edges.append((node, next_node))
+        elif isinstance(next_node, tuple):
+            edges.append((node, next_node[0]))
+    return edges
+
 class Chart(Node):
     """Main container for a flowchart.
 
@@ -56,9 +101,25 @@ class Chart(Node):
     safe_mode: bool
       If safe_mode = True then errors will be caught and the Chart will
       simply proceed to the next node.
+
+    merge_func: function
+      If given, every link out of a node is followed (not just the
+      first) and the flowchart is run as a dependency graph, with
+      independent branches executed concurrently in a thread pool. A
+      node with several incoming links is given
+      merge_func(list_of_states) built from the results of those
+      nodes. Only used when the flowchart has branches but no loops or
+      Decision nodes, otherwise the chart runs one node at a time as
+      usual. Parallel branches receive the same state object, so
+      their nodes should not modify it in place.
+
+      :default:
+        None
     """
 
-    def __init__(self, structure, node_kwargs = {}, logfile=None, safe_mode=False, **kwargs):
+    __slots__ = ("nodes", "state", "safe_mode", "structure_dict", "current_node", "path", "benchmarks", "merge_func", "_schedule", "_dag", "_visual", "_version")
+
+    def __init__(self, structure, node_kwargs = {}, logfile=None, safe_mode=False, merge_func=None, **kwargs):
         super().__init__(**kwargs)
         if isinstance(logfile, str):
             logging.basicConfig(
@@ -69,6 +130,11 @@ class Chart(Node):
         self.safe_mode = safe_mode
         self.structure_dict = {}
         self.current_node = "Start"
+        self.merge_func = merge_func
+        self._schedule = None
+        self._dag = None
+        self._visual = None
+        self._version = 0
         self.build_chart(structure, node_kwargs)
         self.path = []
         self.benchmarks = []
@@ -79,17 +145,38 @@ class Chart(Node):
         self.state = state
         self.path = []
         self.benchmarks = []
-        
-        for node in self:
-            logging.info(f"{self.name}: {node.name} ({datetime.now()})")
-            self.path.append(node.name)
-            start = time()
+        if self.merge_func is not None:
+            if self._dag is None:
+                self._dag = self._compile_dag()
+            if self._dag:
+                self.state = self._run_dag(state)
+                if self.path:
+                    self.current_node = self.path[-1]
+                return self.state
+        if self._schedule is None:
+            self._schedule = self._compile()
+        benchmark = self.enable_benchmark
+        log_steps = logger.isEnabledFor(logging.INFO)
+        record_path = self.path.append
+        record_benchmark = self.benchmarks.append
+
+        for node in (self._schedule or self):
+            if log_steps:
+                logger.info("%s: %s (%s)", self.name, node.name, datetime.now())
+            record_path(node.name)
+            if benchmark:
+                start = perf_counter_ns()
             try:
-                self.state = node(self.state)
+                semaphore = _resource_semaphores.get(node.resource)
+                if semaphore is None or isinstance(node, (Chart, Pipe)):
+                    self.state = node(self.state)
+                else:
+                    with semaphore:
+                        self.state = node(self.state)
             except FlowExitChart as e:
                 if not "End" in self.structure_dict[node.name]:
                     self.link_nodes(node.name, "End")
-                logging.info(f"{self.name}: {node.name} Ended Chart ({datetime.now()})")
+                logger.info("%s: %s Ended Chart (%s)", self.name, node.name, datetime.now())
                 break
             except FlowExit as e:
                 if not "End" in self.structure_dict[node.name]:
@@ -97,20 +184,237 @@ class Chart(Node):
                 if hasattr(node, "state") and node.state is not None:
                     self.state = node.state
                 if self.owner is None:
-                    logging.info(f"{self.name}: {node.name} Ended Flow ({datetime.now()})")
+                    logger.info("%s: %s Ended Flow (%s)", self.name, node.name, datetime.now())
                     break
                 else:
                     raise e
             except Exception as e:
+                self.current_node = node.name
                 if not self.safe_mode:
-                    logging.error(f"on step '{self.current_node}' got error: {str(e)}")
-                    logging.error("with full trace: %s" % traceback.format_exc())
+                    logger.error(f"on step '{self.current_node}' got error: {str(e)}")
+                    logger.error("with full trace: %s" % traceback.format_exc())
                     raise e
             finally:
-                self.benchmarks.append(time() - start)
+                if benchmark:
+                    record_benchmark(perf_counter_ns() - start)
                     
+        self.current_node = node.name
         return self.state
 
+    def _compile(self):
+        """Flatten the path through the flowchart into a list of nodes.
+
+        When every node between start and end has a fixed successor
+        (no Decision nodes or other nodes with a custom "next"
+        method), the path through the chart is the same on every
+        run. In that case it is collected once into a list which
+        "action" can iterate over directly, avoiding the name lookups
+        of the iterator protocol. An empty list is returned if the
+        path can only be determined while running. The result is
+        discarded whenever the structure is changed through the Chart
+        methods.
+        """
+        schedule = []
+        visited = set()
+        node = self.nodes["Start"]
+        while not isinstance(node, End):
+            if type(node).next is not Node.next or len(node.forward) == 0:
+                return []
+            node = node.forward[0]
+            if node.name in visited:
+                return []
+            visited.add(node.name)
+            schedule.append(node)
+        return schedule
+
+    def _compile_dag(self):
+        """Collect the predecessors of every node reachable from start, for
+        running the flowchart as a dependency graph. Predecessors are
+        ordered as the nodes were added to the chart. An empty dict is
+        returned if the flowchart does not branch, contains a loop, or
+        has nodes which choose their successor while running.
+        """
+        preds = {"Start": []}
+        stack = ["Start"]
+        branches = False
+        while stack:
+            name = stack.pop()
+            if not isinstance(self.nodes[name], End) and type(self.nodes[name]).next is not Node.next:
+                return {}
+            branches = branches or len(self.structure_dict[name]) > 1
+            for nxt in self.structure_dict[name]:
+                if nxt not in preds:
+                    preds[nxt] = []
+                    stack.append(nxt)
+                preds[nxt].append(name)
+        if not branches or "End" not in preds:
+            return {}
+
+        # Kahn's algorithm, any node left unvisited is part of a loop
+        waiting = dict((name, len(p)) for name, p in preds.items())
+        ready = ["Start"]
+        visited = 0
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for nxt in self.structure_dict[name]:
+                waiting[nxt] -= 1
+                if waiting[nxt] == 0:
+                    ready.append(nxt)
+        if visited < len(preds):
+            return {}
+
+        order = dict((name, i) for i, name in enumerate(self.nodes))
+        for p in preds.values():
+            p.sort(key=order.get)
+        return preds
+
+    def _call_node(self, node, state):
+        semaphore = _resource_semaphores.get(node.resource)
+        if semaphore is None or isinstance(node, (Chart, Pipe)):
+            return node(state)
+        with semaphore:
+            return node(state)
+
+    def _run_dag(self, state):
+        """Run the flowchart as a dependency graph. Each node is submitted
+        to a thread pool as soon as every node linked to it has
+        finished, see "merge_func".
+        """
+        preds = self._dag
+        waiting = dict((name, len(p)) for name, p in preds.items())
+        results = {"Start": state}
+        inputs = {}
+        running = {}
+
+        def release(name, executor):
+            for nxt in self.structure_dict[name]:
+                waiting[nxt] -= 1
+                if waiting[nxt] > 0:
+                    continue
+                if len(preds[nxt]) == 1:
+                    inputs[nxt] = results[preds[nxt][0]]
+                else:
+                    inputs[nxt] = self.merge_func(list(results[p] for p in preds[nxt]))
+                running[executor.submit(self._call_node, self.nodes[nxt], inputs[nxt])] = nxt
+
+        log_steps = logger.isEnabledFor(logging.INFO)
+        with ThreadPoolExecutor() as executor:
+            release("Start", executor)
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    node = self.nodes[name]
+                    if log_steps:
+                        logger.info("%s: %s (%s)", self.name, name, datetime.now())
+                    self.path.append(name)
+                    if self.enable_benchmark:
+                        self.benchmarks.append(node.benchmark)
+                    try:
+                        results[name] = future.result()
+                    except FlowExitChart as e:
+                        logger.info("%s: %s Ended Chart (%s)", self.name, name, datetime.now())
+                        for f in running:
+                            f.cancel()
+                        return inputs[name]
+                    except FlowExit as e:
+                        for f in running:
+                            f.cancel()
+                        self.state = inputs[name]
+                        if getattr(node, "state", None) is not None:
+                            self.state = node.state
+                        if self.owner is not None:
+                            raise e
+                        logger.info("%s: %s Ended Flow (%s)", self.name, name, datetime.now())
+                        return self.state
+                    except Exception as e:
+                        self.current_node = name
+                        if not self.safe_mode:
+                            logger.error(f"on step '{name}' got error: {str(e)}")
+                            logger.error("with full trace: %s" % traceback.format_exc())
+                            raise e
+                        results[name] = inputs[name]
+                    release(name, executor)
+        return results["End"]
+
+    def clone(self):
+        """Copy of the flowchart for running on a new state. Every node is
+        cloned (see Node.clone) and the clones are linked in the same
+        way as the original nodes, while the run specific values of
+        the chart (state, path, benchmarks) start out empty. The
+        compiled schedule is made once on the original and carried
+        over to the clones, so copies made for each state do not have
+        to compile it again.
+
+        """
+        new = super().clone()
+        new.nodes = dict((name, node.clone()) for name, node in self.nodes.items())
+        for node in new.nodes.values():
+            node.set_owner(new)
+        for name, node in self.nodes.items():
+            for forward_node in node.forward:
+                new.nodes[name].link_forward(new.nodes[forward_node.name])
+        new.structure_dict = dict((name, dict(links)) for name, links in self.structure_dict.items())
+        if self._schedule is None:
+            self._schedule = self._compile()
+        new._schedule = list(new.nodes[node.name] for node in self._schedule)
+        if self.merge_func is not None and self._dag is None:
+            self._dag = self._compile_dag()
+        # only holds node names, so it can be shared
+        new._dag = self._dag
+        new._visual = None
+        new.reset()
+        return new
+
+    def reset(self):
+        """Clear the values left over from the last run (state, path,
+        benchmarks) of the chart and all of its nodes.
+
+        """
+        super().reset()
+        self.state = None
+        self.current_node = "Start"
+        self.path = []
+        self.benchmarks = []
+        for node in self.nodes.values():
+            node.reset()
+
+    def _structure_changed(self):
+        """Discard anything computed from the structure of the flowchart.
+        A chart containing this one draws it as a subgraph, so its
+        cached visual is discarded as well. The version counter lets a
+        Pipe know that copies of the chart it has handed out (i.e. to
+        its worker processes) are out of date.
+        """
+        self._schedule = None
+        self._dag = None
+        self._visual = None
+        self._version += 1
+        if isinstance(self.owner, Chart):
+            self.owner._structure_changed()
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["_schedule"] = None
+        state["_dag"] = None
+        state["_visual"] = None
+        # values from the last run are not part of the flowchart
+        state["state"] = None
+        state["current_node"] = "Start"
+        state["path"] = []
+        state["benchmarks"] = []
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        for name, links in self.structure_dict.items():
+            for name2 in links:
+                node2 = self.nodes[name2]
+                if not hasattr(node2, "reverse"):
+                    node2.reverse = []
+                node2.link_reverse(self.nodes[name])
+
     def add_node(self, node):
         """Add a new Node to the flowchart. This merely makes the flowchart
         aware of the Node, it will need to be linked in order to
@@ -123,58 +427,86 @@ class Chart(Node):
         """
         if node.name in self.structure_dict:
             if self.safe_mode: return
-            raise Flow_LinkError(f"{node.name} already in {self.name}")
+            raise FlowLinkError(f"{node.name} already in {self.name}")
         self.nodes[node.name] = node
         node.set_owner(self)
-        self.structure_dict[node.name] = []
+        # dict used as an ordered set of the names linked to
+        self.structure_dict[node.name] = {}
+        self._structure_changed()
+
+    def _get_node(self, node):
+        """Look up a node of the flowchart by name. A Node object is
+        checked to be the one held by the flowchart, rather than
+        another node with the same name.
+
+        """
+        if isinstance(node, str):
+            return self.nodes[node]
+        if self.nodes.get(node.name) is not node:
+            raise FlowLinkError(f"{node.name} is not a node in {self.name}, use add_node first")
+        return node
 
     def link_nodes(self, node1, node2):
         """Link two nodes in the flowchart. node1 will be linked forward to node2.
 
         Arguments
         -----------------
-        node1: string
-          A Node name in the flowchart which will be linked
-          forward to node2.
+        node1: string or Node
+          A Node name in the flowchart (or the Node object itself)
+          which will be linked forward to node2.
 
-        node2: string
-          A Node name in the flowchart which will have node1 linked to it.
+        node2: string or Node
+          A Node name in the flowchart (or the Node object itself)
+          which will have node1 linked to it.
         """
-        if self.nodes[node2].name in self.structure_dict[self.nodes[node1].name]:
+        node1 = self._get_node(node1)
+        node2 = self._get_node(node2)
+        links = self.structure_dict[node1.name]
+        if node2.name in links:
             if self.safe_mode: return
-            raise Flow_LinkError(f"{self.nodes[node2].name} already linked to {self.nodes[node1].name}")
-        self.nodes[node1].link_forward(self.nodes[node2])
-        self.structure_dict[node1].append(node2)
+            raise FlowLinkError(f"{node2.name} already linked to {node1.name}")
+        node1.link_forward(node2)
+        links[node2.name] = None
+        self._structure_changed()
 
     def unlink_nodes(self, node1, node2):
         """Undo the operations of "link_nodes" and return to previous state.
 
         Arguments
         -----------------
-        node1: string
-          A Node name in the flowchart which was linked forward to node2.
+        node1: string or Node
+          A Node name in the flowchart (or the Node object itself)
+          which was linked forward to node2.
 
-        node2: string
-          A Node name in the flowchart which did have node1 linked to it.
+        node2: string or Node
+          A Node name in the flowchart (or the Node object itself)
+          which did have node1 linked to it.
         """
-        self.nodes[node1].unlink_forward(self.nodes[node2])
-        self.structure_dict[node1].pop(self.structure_dict[node1].index(node2))
+        node1 = self._get_node(node1)
+        node2 = self._get_node(node2)
+        node1.unlink_forward(node2)
+        del self.structure_dict[node1.name][node2.name]
+        self._structure_changed()
 
     def insert_node(self, node1, node2):
         """Insert node1 in the place of node2, and link to node2
 
         Arguments
         -----------------
-        node1: string
-          A Node name in the flowchart which will take the place of node2.
+        node1: string or Node
+          A Node name in the flowchart (or the Node object itself)
+          which will take the place of node2.
 
-        node2: string
-          A Node name in the flowchart which will now come after node1.
+        node2: string or Node
+          A Node name in the flowchart (or the Node object itself)
+          which will now come after node1.
         """
 
-        for reverse_node in list(self.nodes[node2].reverse):
-            self.unlink_nodes(reverse_node.name, node2)
-            self.link_nodes(reverse_node.name, node1)
+        node1 = self._get_node(node1)
+        node2 = self._get_node(node2)
+        for reverse_node in list(node2.reverse):
+            self.unlink_nodes(reverse_node, node2)
+            self.link_nodes(reverse_node, node1)
         self.link_nodes(node1, node2)
 
     def build_chart(self, structure, node_kwargs = {}):
@@ -228,15 +560,10 @@ class Chart(Node):
         if "End" not in self.structure_dict:
             self.add_node(End(**node_kwargs.get("End", {})))
                 
+        for node1, node2 in _normalize_structure(structure):
+            self.link_nodes(node1, node2)
+
         if isinstance(structure, list):
-            for n in range(len(structure)):
-                if isinstance(structure[n],tuple):
-                    for node2 in structure[n][1]:
-                        self.link_nodes(structure[n][0], node2)
-                elif n < len(structure)-1 and isinstance(structure[n], str) and isinstance(structure[n+1],str):
-                    self.link_nodes(structure[n], structure[n+1])
-                elif n < len(structure)-1 and isinstance(structure[n], str) and isinstance(structure[n+1],tuple):
-                    self.link_nodes(structure[n], structure[n+1][0])
             if len(self.nodes["Start"].forward) == 0:
                 if isinstance(structure[0],str):
                     self.link_nodes("Start", structure[0])
@@ -247,13 +574,78 @@ class Chart(Node):
                     self.link_nodes(structure[-1], "End")
                 else:
                     self.link_nodes(structure[-1][0], "End")
-        else:
-            for node1 in structure:
-                if isinstance(structure[node1], str):
-                    self.link_nodes(node1, structure[node1])
-                else:
-                    for node2 in structure[node1]:
-                        self.link_nodes(node1, node2)
+
+    def jit_processes(self, signature=None):
+        """Compile the actions of every Process node in the flowchart
+        with numba, see the "jit" argument of Node. Only actions given
+        to the nodes are compiled, nodes without one (which just pass
+        the state along, or use the "action" method of a subclass) are
+        skipped.
+
+        Arguments
+        -----------------
+        signature: numba signature
+          signature shared by all of the Process actions. When given
+          they are compiled now rather than during the first run, see
+          jit_action.
+
+          :default:
+            None
+        """
+        for node in self.nodes.values():
+            if isinstance(node, Process) and node._action is not None:
+                node._action = jit_action(node._action, signature)
+
+    def enable_memoize(self, node_names, key_fn, maxsize=128):
+        """Cache the results of several nodes in the flowchart, see
+        Node.memoize for the requirements on the nodes.
+
+        Arguments
+        -----------------
+        node_names: list
+          names of the nodes in the flowchart to memoize.
+
+        key_fn: function
+          function of the form: key_fn(state) returns a hashable key.
+          Must be picklable when the chart is run by a Pipe in
+          parallelize mode, see Node.memoize.
+
+        maxsize: int
+          maximum number of results to keep for each node.
+
+          :default:
+            128
+        """
+        for name in node_names:
+            self.nodes[name].memoize(key_fn, maxsize)
+
+    def save(self, filename):
+        """Save the flowchart to a file so that it can be restored later
+        with "Chart.load". The chart is pickled with the highest
+        available protocol (5 on Python 3.8+), so the functions used
+        by its nodes must be importable when loading. Only the
+        flowchart is saved, not the state, path or benchmarks of its
+        last run.
+
+        Arguments
+        -----------------
+        filename: string
+          path to the file where the flowchart will be written.
+        """
+        with open(filename, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, filename):
+        """Restore a flowchart which was written with "save".
+
+        Arguments
+        -----------------
+        filename: string
+          path to a file created by "Chart.save".
+        """
+        with open(filename, "rb") as f:
+            return pickle.load(f)
 
     def draw(self, filename):
         """Visual representation of the flowchart.
@@ -261,7 +653,9 @@ class Chart(Node):
         Creates a visual flowchart using pygraphviz. Every node will
         be drawn, including those that don't have links to other
         nodes, make sure to fully input the desired structure before
-        running this method.
+        running this method. The graph is cached between calls until
+        the structure is changed through the Chart methods, so changes
+        to a node's visual_kwargs made afterwards will not be drawn.
 
         Arguments
         -----------------
@@ -269,11 +663,22 @@ class Chart(Node):
           path to save final graphical representation. Should end in
           .png, .jpg, etc.
         """
-        visual, nodes = self._construct_chart_visual()
+        # layout adds positions to the graph, keep them out of the cache
+        visual = self._get_visual().copy()
         visual.layout()
         visual.draw(filename)
 
+    def _get_visual(self):
+        if self._visual is None:
+            self._visual, nodes = self._construct_chart_visual()
+        return self._visual
+
     def _construct_chart_visual(self, visual = None):
+        # pygraphviz is slow to import and only needed for drawing
+        try:
+            import pygraphviz as pgv
+        except ImportError:
+            raise ImportError("pygraphviz is required to draw or print a Chart, install it with: pip install pygraphviz")
         if not visual:
             visual = pgv.AGraph(strict=True, directed=True, splines="line", overlap=False)
         nodes = []
@@ -286,28 +691,30 @@ class Chart(Node):
                     node.name, **node.visual_kwargs
                 )
                 nodes.append(node.name)
-        for node1, links in self.structure_dict.items():
-            for node2 in links:
-                visual.add_edge(node1, node2)
+        visual.add_edges_from(
+            (node1, node2) for node1, links in self.structure_dict.items() for node2 in links
+        )
         return visual, nodes
 
     def __str__(self):
-        visual, nodes = self._construct_chart_visual()
-        return visual.string()
+        return self._get_visual().string()
 
     def __iter__(self):
-        self.current_node = "Start"
-        return self
+        """Walk the flowchart from start until a node has no next node
+        (the End node). Each successor is requested only after the
+        previous node has been run, so Decision nodes can choose it.
 
-    def __next__(self):
-        # try:
-        self.current_node = self.nodes[self.current_node].next().name
-        # except AttributeError:
-        #     next_node = next(self.nodes[self.current_node])
-        #     assert self.current_node in self.nodes
-        #     self.link_nodes(self.current_node, next_node)
-        #     self.current_node = next_node
-        return self.nodes[self.current_node]
+        """
+        node = self.nodes["Start"]
+        while True:
+            try:
+                node = node.next()
+            except Exception:
+                self.current_node = node.name
+                raise
+            if node is None:
+                return
+            yield node
 
 
 class Pipe(Node):
@@ -315,10 +722,15 @@ class Pipe(Node):
 
     A pipe is initialized with a Chart object (or Node) and can then
     be called on a state, the pipe will make a copy of the flowchart
-    to run on the state and will apply that copy. This way each state
-    is processed with a fresh version of the class (otherwise some
-    class variables could be altered). This is most important when
-    running processes in parallel. There are three processing modes
+    to run on the state and will apply that copy. The copy is made
+    with the "clone" method of the flowchart, so each state gets its
+    own nodes with the run values (state, path, benchmarks) cleared,
+    but the nodes share their actions and any other attributes with
+    the original (see Node.clone). A node which keeps mutable values
+    of its own between runs (i.e. a counter or a list of results)
+    should override "clone" (and "reset") to give each copy its own,
+    otherwise the states all share the same object (in parallelize
+    mode, those run by one worker). There are three processing modes
     for a Pipe: parallelize, iterate, and pass.  The parallelize mode
     will apply the flowchart on each element of the state in parallel
     up to the specified number of cores. The iterate mode will do the
@@ -346,8 +758,8 @@ class Pipe(Node):
     safe_mode: bool
       indicate how to handle errors. In safe mode, any error raised by
       an individual run will simply return None. However, the path and
-      benchmarks for the chart will still be saved thus allowing one
-      to diagnose where the error occured. When safe mode is off,
+      benchmarks (if enabled) for the chart will still be saved thus
+      allowing one to diagnose where the error occured. When safe mode is off,
       errors will be raised out of the Pipe object.
 
     process_mode: string
@@ -361,35 +773,178 @@ class Pipe(Node):
     cores: int
       number of processes to generate in parallelize mode.
 
+      :default:
+        os.cpu_count(), or 1 if it is unknown
+
+    chunksize: int
+      number of states sent to a worker process at a time in
+      parallelize mode. Larger chunks cut the communication overhead
+      for many cheap states, smaller chunks balance the load better
+      when states take very different amounts of time.
+
+      :default:
+        len(state) // (4 * cores), at least 1
+
+    reuse_chart: bool
+      If True a single copy of the flowchart is made (per process) and
+      reset with its "reset" method before each state, instead of
+      cloning the flowchart for every state. Only safe when the nodes
+      keep nothing between runs beyond what "reset" clears.
+
+      :default:
+        False
+
+    resources: dict
+      maximum number of nodes with a given "resource" tag which may
+      run at the same time across the worker processes in
+      parallelize mode, e.g. {'gpu': 1}. Nodes with other (or no)
+      tags are not limited. Only the nodes which do the work are
+      limited, a tag on a Chart or Pipe is ignored (tag the nodes
+      inside it instead).
+
+      :default:
+        None
+
+    The worker processes for parallelize mode are started on first use
+    and kept alive between calls, receiving a copy of the Pipe at
+    startup. They are restarted when the settings of the Pipe or the
+    structure of its flowchart (through the Chart methods) have
+    changed, and shut down when the Pipe is garbage collected. Use the
+    Pipe as a context manager, or call "close", to shut them down
+    sooner, or for the workers to see other changes such as new node
+    actions. A Pipe inside a Chart, or one made with "clone", starts
+    its workers for each call instead.
+
+    The paths and benchmarks of the charts run by the Pipe are kept
+    in the "paths" and "benchmarks" attributes, these only hold the
+    results of the most recent call.
+
     """
 
+    __slots__ = ("flowchart", "safe_mode", "process_mode", "cores", "chunksize", "return_success", "resources", "reuse_chart", "benchmarks", "paths", "_pool", "_pool_key", "_pool_finalizer", "_persistent", "_chart", "_chart_version", "__weakref__")
+
     def __init__(
-            self, flowchart, safe_mode=True, process_mode="parallelize", cores=4, return_success = False, **kwargs
+            self, flowchart, safe_mode=True, process_mode="parallelize", cores=None, chunksize=None, return_success = False, resources = None, reuse_chart = False, **kwargs
     ):
 
         super().__init__(**kwargs)
+        self._pool = None
+        self._persistent = True
         self.update_flowchart(flowchart)
         self.safe_mode = safe_mode
         self.process_mode = process_mode
-        self.cores = cores
+        # cpu_count returns None when the count cannot be determined
+        self.cores = cores if cores is not None else (os.cpu_count() or 1)
+        self.chunksize = chunksize
+        self.return_success = return_success
+        self.resources = resources if resources is not None else {}
+        self.reuse_chart = reuse_chart
         self.visual_kwargs['shape'] = "parallelogram"
 
     def update_flowchart(self, flowchart):
+        """Set the flowchart which will be applied to each state.
 
+        Every state is processed by a fresh copy of the flowchart made
+        with its "clone" method, which is much cheaper than a deepcopy
+        of the full node graph (or by one reused copy, see the
+        "reuse_chart" argument). Worker processes in parallelize mode
+        receive the flowchart when they start, so this also shuts
+        them down.
+
+        Arguments
+        -----------------
+        flowchart: Chart
+          Instance of a Chart object (or Node) which is to be called
+          on a number of states.
+        """
+        self.close()
         self.flowchart = flowchart
+        self._chart = None
         self.benchmarks = []
         self.paths = []
 
+    def _new_pool(self):
+        semaphores = dict((tag, Semaphore(limit)) for tag, limit in self.resources.items())
+        pipe_bytes = pickle.dumps(self.clone(), protocol=pickle.HIGHEST_PROTOCOL)
+        return Pool(self.cores, initializer=_init_worker, initargs=(pipe_bytes, semaphores))
+
+    def _get_pool(self):
+        key = (
+            getattr(self.flowchart, "_version", 0),
+            self.safe_mode,
+            self.return_success,
+            self.reuse_chart,
+            self.cores,
+            tuple(sorted(self.resources.items())),
+        )
+        if self._pool is not None and self._pool_key != key:
+            self.close()
+        if self._pool is None:
+            self._pool = self._new_pool()
+            self._pool_key = key
+            # only the pool is referenced, so the Pipe can still be collected
+            self._pool_finalizer = weakref.finalize(self, self._pool.terminate)
+        return self._pool
+
+    def close(self):
+        """Shut down the worker processes used in parallelize mode. A new
+        set of workers will be started if the Pipe is used again.
+
+        """
+        if self._pool is not None:
+            self._pool_finalizer.detach()
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["_pool"] = None
+        state["_pool_key"] = None
+        state["_pool_finalizer"] = None
+        state["_chart"] = None
+        return state
+
+    def reset(self):
+        super().reset()
+        self.benchmarks = []
+        self.paths = []
+
+    def clone(self):
+        new = super().clone()
+        new._pool = None
+        new._pool_key = None
+        new._pool_finalizer = None
+        new._persistent = False
+        new._chart = None
+        new.reset()
+        return new
+
     def apply_chart(self, state):
 
-        chart = deepcopy(self.flowchart)
-        logging.info(f"PIPE:{self.name}({self.process_mode}): {chart.name} ({datetime.now()})")
+        if self.reuse_chart:
+            version = getattr(self.flowchart, "_version", 0)
+            if self._chart is None or self._chart_version != version:
+                self._chart = self.flowchart.clone()
+                self._chart_version = version
+            chart = self._chart
+            chart.reset()
+        else:
+            chart = self.flowchart.clone()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("PIPE:%s(%s): %s (%s)", self.name, self.process_mode, chart.name, datetime.now())
         if self.safe_mode:
             try:
                 res = chart(state)
             except Exception as e:
-                logging.error(f"on step '{chart.current_node}' got error: {str(e)}")
-                logging.error("with full trace: %s" % traceback.format_exc())
+                logger.error(f"on step '{chart.current_node}' got error: {str(e)}")
+                logger.error("with full trace: %s" % traceback.format_exc())
                 res = None
         else:
             res = chart(state)
@@ -406,15 +961,24 @@ class Pipe(Node):
             return res, timing, path
 
     def _run(self, state):
+        self.benchmarks = []
+        self.paths = []
         if self.process_mode == "parallelize":
             starttime = time()
-            with Pool(self.cores) as pool:
-                result = pool.map(self.apply_chart, state)
-                for r in result:
-                    self.benchmarks.append(r[1])
-                    self.paths.append(r[2])
-                logging.info(f"PIPE:Finished parallelize run in {time() - starttime} sec")
-                return list(r[0] for r in result)
+            state = list(state)
+            chunksize = self.chunksize
+            if chunksize is None:
+                chunksize = max(1, len(state) // (4 * self.cores))
+            if self._persistent and self.owner is None:
+                result = list(self._get_pool().imap(_apply_chart_worker, state, chunksize))
+            else:
+                with self._new_pool() as pool:
+                    result = list(pool.imap(_apply_chart_worker, state, chunksize))
+            for r in result:
+                self.benchmarks.append(r[1])
+                self.paths.append(r[2])
+            logger.info("PIPE:Finished parallelize run in %s sec", time() - starttime)
+            return list(r[0] for r in result)
         elif self.process_mode == "iterate":
             result = map(self.apply_chart, state)
             ret = []
@@ -0,0 +1,103 @@
+"""Actions and small flowcharts shared by the tests. The actions are
+defined at module level so that charts using them can be pickled
+(saved, or sent to the worker processes of a Pipe).
+"""
+
+import context
+from context import flow
+
+def add_a(state):
+    return state + ("a",)
+
+def add_b(state):
+    return state + ("b",)
+
+def add_c(state):
+    return state + ("c",)
+
+def merge(states):
+    return tuple(s for state in states for s in state)
+
+def exit_chart(state):
+    raise flow.FlowExitChart("stop")
+
+def exit_flow(state):
+    raise flow.FlowExit("stop")
+
+def square(state):
+    return state ** 2
+
+def increment(state):
+    return state + 1
+
+def negate(state):
+    return -state
+
+def times_ten(state):
+    return state * 10
+
+def identity(state):
+    return state
+
+def choose_small(state):
+    return "Small" if state < 10 else "Big"
+
+def fail(state):
+    raise ValueError("failed")
+
+def fail_odd(state):
+    if state % 2:
+        raise ValueError("odd state")
+    return state
+
+
+def make_chart(*actions, **kwargs):
+    """Chart running the given actions one after another, as nodes
+    named P0, P1, ...
+    """
+    C = flow.Chart(structure={}, **kwargs)
+    prev = "Start"
+    for i, action in enumerate(actions):
+        name = f"P{i}"
+        C.add_node(flow.Process(name=name, action=action))
+        C.link_nodes(prev, name)
+        prev = name
+    C.link_nodes(prev, "End")
+    return C
+
+def make_diamond(second=add_b, **kwargs):
+    """Start -> A -> (B, C) -> D -> End, run as a dependency graph."""
+    C = flow.Chart(structure={}, merge_func=merge, **kwargs)
+    C.add_node(flow.Process(name="A", action=add_a))
+    C.add_node(flow.Process(name="B", action=second))
+    C.add_node(flow.Process(name="C", action=add_c))
+    C.add_node(flow.Process(name="D", action=add_a))
+    C.link_nodes("Start", "A")
+    C.link_nodes("A", "B")
+    C.link_nodes("A", "C")
+    C.link_nodes("B", "D")
+    C.link_nodes("C", "D")
+    C.link_nodes("D", "End")
+    return C
+
+def make_decision_chart(choose=choose_small):
+    """Start -> Check -> (Small, Big) -> End, Check picks a branch by
+    the size of the state.
+    """
+    C = flow.Chart(structure={})
+    C.add_node(flow.Decision(name="Check", action=choose))
+    C.add_node(flow.Process(name="Small", action=times_ten))
+    C.add_node(flow.Process(name="Big", action=negate))
+    C.link_nodes("Start", "Check")
+    C.link_nodes("Check", "Small")
+    C.link_nodes("Check", "Big")
+    C.link_nodes("Small", "End")
+    C.link_nodes("Big", "End")
+    return C
+
+def links(chart):
+    """Names of the forward and reverse links of every node."""
+    return dict(
+        (name, ([F.name for F in node.forward], [R.name for R in node.reverse]))
+        for name, node in chart.nodes.items()
+    )
@@ -0,0 +1,83 @@
+import unittest
+
+import context
+from context import flow
+from helpers import *
+
+
+class TestSchedule(unittest.TestCase):
+
+    def test_schedule(self):
+        C = make_chart(square, increment)
+        self.assertEqual(C(3), 10)
+        self.assertEqual(list(node.name for node in C._schedule), ["P0", "P1", "End"])
+        self.assertEqual(C.path, ["P0", "P1", "End"])
+
+    def test_no_schedule_with_decision(self):
+        C = make_decision_chart()
+        self.assertEqual(C(3), 30)
+        self.assertEqual(C._schedule, [])
+        self.assertEqual(C(30), -30)
+        self.assertEqual(C.path, ["Check", "Big", "End"])
+
+    def test_edit_after_run(self):
+        C = make_chart(increment)
+        self.assertEqual(C(3), 4)
+        C.add_node(flow.Process(name="Square", action=square))
+        C.insert_node("Square", "P0")
+        self.assertEqual(C(3), 10)
+
+
+class TestLinks(unittest.TestCase):
+
+    def test_link_objects(self):
+        C = make_chart(square)
+        node = flow.Process(name="Inc", action=increment)
+        C.add_node(node)
+        C.unlink_nodes(C.nodes["P0"], C.nodes["End"])
+        C.link_nodes(C.nodes["P0"], node)
+        C.link_nodes(node, "End")
+        self.assertEqual(C(3), 10)
+
+    def test_foreign_node(self):
+        C = make_chart(square, increment)
+        other = flow.Process(name="P1", action=times_ten)
+        for link in (C.link_nodes, C.unlink_nodes, C.insert_node):
+            with self.assertRaises(flow.FlowLinkError):
+                link("P0", other)
+            with self.assertRaises(flow.FlowLinkError):
+                link(other, "End")
+        self.assertEqual(links(C)["P1"], (["End"], ["P0"]))
+        self.assertEqual(C.structure_dict["P0"], {"P1": None})
+        self.assertEqual(C(3), 10)
+
+
+class TestCurrentNode(unittest.TestCase):
+
+    def test_finished(self):
+        C = make_chart(increment)
+        self.assertEqual(C.current_node, "Start")
+        C(1)
+        self.assertEqual(C.current_node, "End")
+        C = make_decision_chart()
+        C(1)
+        self.assertEqual(C.current_node, "End")
+
+    def test_error(self):
+        C = make_chart(increment, fail_odd, increment)
+        with self.assertRaises(ValueError), self.assertLogs("flow", "ERROR"):
+            C(2)
+        self.assertEqual(C.current_node, "P1")
+        self.assertEqual(C(1), 3)
+        self.assertEqual(C.current_node, "End")
+
+    def test_dead_end(self):
+        C = make_chart(increment, increment)
+        C.unlink_nodes("P1", "End")
+        with self.assertRaises(IndexError):
+            C(1)
+        self.assertEqual(C.current_node, "P1")
+
+
+if __name__ == "__main__":
+    unittest.main()
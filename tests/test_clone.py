@@ -0,0 +1,151 @@
+import copy
+import os
+import pickle
+import tempfile
+import unittest
+
+import context
+from context import flow
+from helpers import *
+
+
+class Collector(flow.Process):
+    """Keeps the states it has seen, so each copy needs its own list."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.seen = []
+
+    def clone(self):
+        new = super().clone()
+        new.seen = []
+        return new
+
+    def action(self, state):
+        self.seen.append(state)
+        return len(self.seen)
+
+
+class LinkTestCase(unittest.TestCase):
+
+    def check_links(self, new, old):
+        self.assertEqual(links(new), links(old))
+        self.assertEqual(new.structure_dict, old.structure_dict)
+        for node in new.nodes.values():
+            self.assertIs(node.owner, new)
+            for F in node.forward:
+                self.assertIs(F, new.nodes[F.name])
+            for R in node.reverse:
+                self.assertIs(R, new.nodes[R.name])
+
+
+class TestClone(LinkTestCase):
+
+    def test_clone(self):
+        C = make_chart(add_a, add_b, add_c)
+        C(())
+        new = C.clone()
+        self.check_links(new, C)
+        self.assertIsNot(new.nodes["P0"], C.nodes["P0"])
+        self.assertEqual(new.path, [])
+        for node in new._schedule:
+            self.assertIs(node, new.nodes[node.name])
+        self.assertEqual(new(()), ("a", "b", "c"))
+
+    def test_clone_is_independent(self):
+        C = make_chart(increment)
+        new = C.clone()
+        new.add_node(flow.Process(name="Square", action=square))
+        new.insert_node("Square", "P0")
+        self.assertEqual(new(3), 10)
+        self.assertEqual(C(3), 4)
+
+    def test_clone_subchart(self):
+        outer = make_chart(add_a)
+        outer.add_node(make_diamond(name="inner"))
+        outer.insert_node("inner", "P0")
+        new = outer.clone()
+        self.check_links(new, outer)
+        self.check_links(new.nodes["inner"], outer.nodes["inner"])
+        self.assertIs(new.nodes["inner"].owner, new)
+        self.assertEqual(new(()), outer(()))
+
+    def test_clone_override(self):
+        C = flow.Chart(structure={})
+        C.add_node(Collector(name="Collect"))
+        C.link_nodes("Start", "Collect")
+        C.link_nodes("Collect", "End")
+        P = flow.Pipe(C, process_mode="iterate")
+        self.assertEqual(P(range(3)), [1, 1, 1])
+        self.assertEqual(C.nodes["Collect"].seen, [])
+
+    def test_clone_decision(self):
+        C = make_decision_chart()
+        C(30)
+        new = C.clone()
+        self.check_links(new, C)
+        self.assertEqual(new.nodes["Check"].next_index, 0)
+        self.assertEqual(new(3), 30)
+        self.assertEqual(new(30), -30)
+
+
+class TestPickle(LinkTestCase):
+
+    def test_pickle(self):
+        C = make_chart(add_a, add_b)
+        C.add_node(make_diamond(name="inner"))
+        C.insert_node("inner", "P1")
+        C(())
+        new = pickle.loads(pickle.dumps(C))
+        self.check_links(new, C)
+        self.check_links(new.nodes["inner"], C.nodes["inner"])
+        self.assertEqual(new.path, [])
+        self.assertEqual(new(()), C(()))
+
+    def test_pickle_decision(self):
+        C = make_decision_chart()
+        new = pickle.loads(pickle.dumps(C))
+        self.check_links(new, C)
+        self.assertEqual(new(3), 30)
+        self.assertEqual(new(30), -30)
+
+    def test_copy_node(self):
+        C = make_chart(add_a, add_b)
+        for copy_node in (copy.copy, copy.deepcopy):
+            node = copy_node(C.nodes["P1"])
+            self.assertEqual(list(R.name for R in node.reverse), ["P0"])
+            self.assertEqual(list(F.name for F in node.forward), ["End"])
+        node = copy.copy(C.nodes["P1"])
+        self.assertIs(node.reverse[0], C.nodes["P0"])
+        node = pickle.loads(pickle.dumps(C.nodes["P1"]))
+        self.assertEqual(list(R.name for R in node.reverse), ["P0"])
+        self.assertIs(node.reverse[0], node.owner.nodes["P0"])
+
+    def test_deepcopy(self):
+        C = make_chart(add_a, add_b)
+        new = copy.deepcopy(C)
+        self.check_links(new, C)
+        self.assertEqual(new(()), ("a", "b"))
+
+
+class TestSave(LinkTestCase):
+
+    def test_save_load(self):
+        C = make_chart(add_a, add_b)
+        C(())
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "chart.pickle")
+            C.save(filename)
+            new = flow.Chart.load(filename)
+        self.check_links(new, C)
+        self.assertEqual(new.path, [])
+        self.assertEqual(new(()), ("a", "b"))
+
+    def test_namespace(self):
+        # pickle is used through the module, nothing leaks into flow
+        self.assertFalse(hasattr(flow, "load"))
+        self.assertFalse(hasattr(flow, "dump"))
+
+
+if __name__ == "__main__":
+    unittest.main()
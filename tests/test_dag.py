@@ -0,0 +1,57 @@
+import unittest
+
+import context
+from context import flow
+from helpers import *
+
+
+class TestDAG(unittest.TestCase):
+
+    def test_merge_order(self):
+        C = make_diamond()
+        # merged in the order the nodes were added, not the order they finished
+        for _ in range(5):
+            self.assertEqual(C(()), ("a", "b", "a", "c", "a"))
+        self.assertEqual(sorted(C.path), ["A", "B", "C", "D", "End"])
+        self.assertEqual(C.current_node, "End")
+
+    def test_exit_chart(self):
+        C = make_diamond(second=exit_chart)
+        self.assertEqual(C(()), ("a",))
+
+    def test_exit_flow(self):
+        C = make_diamond(second=exit_flow)
+        self.assertEqual(C(()), ("a",))
+
+    def test_exit_flow_subchart(self):
+        # the sub-chart hands back the state reached before the exiting node
+        outer = make_chart(add_c)
+        outer.add_node(make_diamond(second=exit_flow, name="inner"))
+        outer.insert_node("inner", "P0")
+        self.assertEqual(outer(()), ("a",))
+
+    def test_error(self):
+        C = make_diamond(second=fail)
+        with self.assertRaises(ValueError), self.assertLogs("flow", "ERROR"):
+            C(())
+        self.assertEqual(C.current_node, "B")
+
+    def test_loop_falls_back(self):
+        C = flow.Chart(structure={}, merge_func=merge)
+        C.add_node(flow.Process(name="Inc", action=increment))
+        C.add_node(flow.Decision(name="Check", action=choose_small))
+        C.add_node(flow.Process(name="Small", action=identity))
+        C.add_node(flow.Process(name="Big", action=identity))
+        C.link_nodes("Start", "Inc")
+        C.link_nodes("Inc", "Check")
+        C.link_nodes("Check", "Small")
+        C.link_nodes("Check", "Big")
+        C.link_nodes("Small", "Inc")
+        C.link_nodes("Big", "End")
+        self.assertEqual(C(0), 10)
+        self.assertEqual(C._dag, {})
+        self.assertEqual(C.current_node, "End")
+
+
+if __name__ == "__main__":
+    unittest.main()
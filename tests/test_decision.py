@@ -0,0 +1,83 @@
+import unittest
+
+import context
+from context import flow
+from helpers import *
+
+def choose_index(state):
+    return 1 if state >= 10 else 0
+
+def choose_unknown(state):
+    return "Medium"
+
+
+class TestDecision(unittest.TestCase):
+
+    def test_back_to_first(self):
+        C = make_decision_chart()
+        self.assertEqual(C(30), -30)
+        # choosing the first branch after another one was chosen
+        self.assertEqual(C(3), 30)
+        self.assertEqual(C.path, ["Check", "Small", "End"])
+
+    def test_index(self):
+        C = make_decision_chart(choose_index)
+        self.assertEqual(C(30), -30)
+        self.assertEqual(C(3), 30)
+
+    def test_node(self):
+        small, big = flow.Process(name="Small"), flow.Process(name="Big")
+        check = flow.Decision(name="Check", action=lambda state: small if state < 10 else big)
+        check.link_forward(small)
+        check.link_forward(big)
+        check(30)
+        self.assertIs(check.next(), big)
+        check(3)
+        self.assertIs(check.next(), small)
+
+    def test_unknown(self):
+        C = make_decision_chart(choose_unknown)
+        with self.assertRaises(ValueError), self.assertLogs("flow", "ERROR"):
+            C(3)
+        self.assertEqual(C.current_node, "Check")
+        check = flow.Decision(name="Check", action=lambda state: flow.Process(name="Other"))
+        check.link_forward(flow.Process(name="P"))
+        with self.assertRaises(ValueError):
+            check(3)
+
+
+class TestUnlink(unittest.TestCase):
+
+    def test_unlink_chosen(self):
+        C = make_decision_chart()
+        self.assertEqual(C(30), -30)
+        C.unlink_nodes("Check", "Big")
+        check = C.nodes["Check"]
+        self.assertEqual(check.next_index, 0)
+        self.assertEqual(check.forward_index, {"Small": 0})
+        self.assertIs(check.next(), C.nodes["Small"])
+        with self.assertRaises(ValueError), self.assertLogs("flow", "ERROR"):
+            C(30)
+
+    def test_unlink_shifts(self):
+        C = make_decision_chart(choose_index)
+        C.unlink_nodes("Check", "Small")
+        C.link_nodes("Check", "Small")
+        # Big is now first, Small second
+        self.assertEqual(C.nodes["Check"].forward_index, {"Big": 0, "Small": 1})
+        self.assertEqual(C(30), 300)
+        self.assertEqual(C(3), -3)
+
+    def test_unlink_node(self):
+        small, big = flow.Process(name="Small"), flow.Process(name="Big")
+        check = flow.Decision(name="Check", action=choose_small)
+        check.link_forward(small)
+        check.link_forward(big)
+        check(30)
+        check.unlink_forward(big)
+        self.assertIs(check.next(), small)
+        self.assertEqual(big.reverse, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import functools
+import pickle
+import unittest
+from unittest import mock
+
+import context
+from context import flow
+from helpers import *
+
+# numba is optional, these stand in for njit so the wrapping can be
+# tested without it
+
+def fake_njit(*args, **kwargs):
+    def compile(func):
+        def compiled(state):
+            return func(state)
+        compiled.py_func = func
+        return compiled
+    return compile
+
+SIGNATURES = []
+
+def recording_njit(*args, **kwargs):
+    SIGNATURES.append(args[0] if args else None)
+    return fake_njit()
+
+def failing_njit(*args, **kwargs):
+    raise RuntimeError("cannot compile")
+
+def typing_error_njit(*args, **kwargs):
+    def compile(func):
+        def compiled(state):
+            raise TypeError("cannot type state")
+        return compiled
+    return compile
+
+def patch_njit(njit=fake_njit):
+    return mock.patch.multiple(
+        "flow.core", njit=njit, TypingError=TypeError, create=True
+    )
+
+
+class SlotSquare(flow.Process):
+    __slots__ = ()
+
+    def action(self, state):
+        return state ** 2
+
+class Counter(flow.Process):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.n = 0
+
+    def action(self, state):
+        self.n += 1
+        return state
+
+
+class TestJitAction(unittest.TestCase):
+
+    def test_no_numba(self):
+        with patch_njit(None), self.assertLogs("flow", "WARNING"):
+            self.assertIs(flow.jit_action(square), square)
+
+    def test_compile(self):
+        with patch_njit():
+            action = flow.jit_action(square)
+            # already compiled actions are not wrapped again
+            self.assertIs(flow.jit_action(action), action)
+        self.assertIsInstance(action, flow.core._JitAction)
+        self.assertIs(action.compiled.py_func, square)
+        self.assertEqual(action(3), 9)
+
+    def test_compile_fails(self):
+        with patch_njit(failing_njit), self.assertLogs("flow", "WARNING"):
+            action = flow.jit_action(square)
+        self.assertIsNone(action.compiled)
+        self.assertEqual(action(3), 9)
+
+    def test_typing_error(self):
+        with patch_njit(typing_error_njit):
+            action = flow.jit_action(square)
+            with self.assertLogs("flow", "WARNING"):
+                self.assertEqual(action(3), 9)
+            self.assertIsNone(action.compiled)
+            self.assertEqual(action(4), 16)
+
+    def test_pickle(self):
+        with patch_njit():
+            action = flow.jit_action(square)
+            new = pickle.loads(pickle.dumps(action))
+        self.assertIsInstance(new, flow.core._JitAction)
+        self.assertIs(new.func, square)
+        self.assertIs(new.compiled.py_func, square)
+        self.assertEqual(new(3), 9)
+
+    def test_not_a_function(self):
+        node = flow.Process(name="P", action=increment)
+        for func in (functools.partial(pow, exp=2), abs, node.next, Counter()):
+            with patch_njit(), self.assertLogs("flow", "WARNING"):
+                self.assertIs(flow.jit_action(func), func)
+
+    def test_node_jit(self):
+        with patch_njit():
+            node = flow.Process(name="P", action=square, jit=True)
+        self.assertIsInstance(node._action, flow.core._JitAction)
+        self.assertEqual(node(3), 9)
+
+
+class TestJitSignature(unittest.TestCase):
+
+    def setUp(self):
+        del SIGNATURES[:]
+
+    def test_signature(self):
+        with patch_njit(recording_njit):
+            action = flow.jit_action(square, "int64(int64)")
+            self.assertEqual(SIGNATURES, ["int64(int64)"])
+            self.assertIs(flow.jit_action(action, "int64(int64)"), action)
+            # a new signature compiles the original function again
+            new = flow.jit_action(action, "float64(float64)")
+        self.assertIsNot(new, action)
+        self.assertIs(new.func, square)
+        self.assertEqual(SIGNATURES, ["int64(int64)", "float64(float64)"])
+
+    def test_node_signature(self):
+        with patch_njit(recording_njit):
+            node = flow.Process(name="P", action=square, jit=True, jit_signature="int64(int64)")
+        self.assertEqual(node._action.signature, "int64(int64)")
+        self.assertEqual(SIGNATURES, ["int64(int64)"])
+
+    def test_jit_processes_signature(self):
+        C = make_chart(square, increment)
+        with patch_njit(recording_njit):
+            C.jit_processes("int64(int64)")
+        self.assertEqual(SIGNATURES, ["int64(int64)"] * 2)
+        self.assertEqual(C(3), 10)
+
+
+class TestJitProcesses(unittest.TestCase):
+
+    def test_jit_processes(self):
+        C = make_chart(square, increment)
+        with patch_njit():
+            C.jit_processes()
+        for name in ("P0", "P1"):
+            self.assertIsInstance(C.nodes[name]._action, flow.core._JitAction)
+        self.assertEqual(C(3), 10)
+
+    def test_skip_action_methods(self):
+        C = flow.Chart(structure={})
+        C.add_node(SlotSquare(name="Square"))
+        C.add_node(Counter(name="Counter"))
+        C.link_nodes("Start", "Square")
+        C.link_nodes("Square", "Counter")
+        C.link_nodes("Counter", "End")
+        with patch_njit():
+            C.jit_processes()
+        self.assertNotIn("action", C.nodes["Counter"].__dict__)
+        new = C.clone()
+        self.assertEqual(new(3), 9)
+        # the clone runs its own node, not the original
+        self.assertEqual(new.nodes["Counter"].n, 1)
+        self.assertEqual(C.nodes["Counter"].n, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
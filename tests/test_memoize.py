@@ -0,0 +1,71 @@
+import gc
+import unittest
+
+import context
+from context import flow
+from helpers import *
+
+CALLS = []
+
+def counted(state):
+    CALLS.append(state)
+    return state * 2
+
+
+class TestMemoize(unittest.TestCase):
+
+    def setUp(self):
+        del CALLS[:]
+
+    def test_process(self):
+        C = make_chart(counted, increment)
+        C.enable_memoize(["P0"], identity, maxsize=2)
+        self.assertEqual(list(C(s) for s in [1, 2, 1, 3, 1]), [3, 5, 3, 7, 3])
+        # 2 was the least recently used result when 3 was added
+        self.assertEqual(CALLS, [1, 2, 3])
+        self.assertEqual(C(2), 5)
+        self.assertEqual(CALLS, [1, 2, 3, 2])
+
+    def test_subchart(self):
+        outer = make_chart(increment)
+        inner = make_chart(counted, name="inner")
+        outer.add_node(inner)
+        outer.insert_node("inner", "P0")
+        inner.memoize(identity)
+        self.assertEqual(outer(1), 3)
+        self.assertEqual(outer(1), 3)
+        self.assertEqual(CALLS, [1])
+
+    def test_pipe(self):
+        P = flow.Pipe(make_chart(counted), process_mode="iterate")
+        P.memoize(tuple)
+        self.assertEqual(P([1, 2]), [2, 4])
+        self.assertEqual(P([1, 2]), [2, 4])
+        self.assertEqual(CALLS, [1, 2])
+
+    def test_clones_share_cache(self):
+        C = make_chart(counted)
+        C.enable_memoize(["P0"], identity)
+        P = flow.Pipe(C, process_mode="iterate")
+        self.assertEqual(P([1, 1, 2, 1]), [2, 2, 4, 2])
+        self.assertEqual(CALLS, [1, 2])
+
+    def test_parallelize(self):
+        C = make_chart(square, increment)
+        C.enable_memoize(["P0"], identity)
+        with flow.Pipe(C, cores=2) as P:
+            self.assertEqual(P([1, 2, 1, 2]), [2, 5, 2, 5])
+
+    def test_cache_dropped_with_node(self):
+        node = flow.Process(name="P", action=counted)
+        node.memoize(identity)
+        token = node._memo.token
+        node(1)
+        self.assertIn(token, flow.core._memo_caches)
+        del node
+        gc.collect()
+        self.assertNotIn(token, flow.core._memo_caches)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import copy
+import pickle
+import unittest
+
+import context
+from context import flow
+from helpers import *
+
+
+class Doubler(flow.Process):
+    __slots__ = ("factor",)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.factor = 2
+
+    def action(self, state):
+        return super().action(state) * self.factor
+
+class DictNode(flow.Process):
+
+    def action(self, state):
+        return super().action(state) + 1
+
+
+class TestAction(unittest.TestCase):
+
+    def test_default(self):
+        node = flow.Process(name="P")
+        self.assertEqual(node.action(3), 3)
+        self.assertEqual(node(3), 3)
+
+    def test_given_action(self):
+        node = flow.Process(name="P", action=square)
+        self.assertEqual(node.action(3), 9)
+        self.assertEqual(node(3), 9)
+
+    def test_subclass(self):
+        self.assertEqual(Doubler()(3), 6)
+        self.assertEqual(DictNode()(3), 4)
+        # a given action takes the place of the action method
+        self.assertEqual(Doubler(action=square)(3), 9)
+
+    def test_chart_action(self):
+        C = flow.Chart(structure={}, action=square)
+        self.assertEqual(C(3), 9)
+
+    def test_copies(self):
+        for node in (Doubler(action=square), DictNode(action=square)):
+            for new in (node.clone(), pickle.loads(pickle.dumps(node)), copy.deepcopy(node)):
+                self.assertIs(type(new), type(node))
+                self.assertEqual(new(3), node(3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from unittest import mock
+
+import context
+from context import flow
+from helpers import *
+
+
+class TestPipe(unittest.TestCase):
+
+    def test_iterate_order(self):
+        P = flow.Pipe(make_chart(square, increment), process_mode="iterate")
+        self.assertEqual(P(range(10)), [i ** 2 + 1 for i in range(10)])
+        self.assertEqual(P.paths, [["P0", "P1", "End"]] * 10)
+
+    def test_safe_mode(self):
+        P = flow.Pipe(make_chart(fail_odd), process_mode="iterate", return_success=True)
+        with self.assertLogs("flow", "ERROR"):
+            self.assertEqual(P(range(4)), [True, False, True, False])
+
+    def test_parallelize_order(self):
+        C = make_chart(square, increment)
+        with flow.Pipe(C, cores=2, chunksize=3) as P:
+            self.assertEqual(P(range(20)), [i ** 2 + 1 for i in range(20)])
+            self.assertEqual(len(P.paths), 20)
+            # workers are restarted after the flowchart is edited
+            C.add_node(flow.Process(name="Negate", action=negate))
+            C.insert_node("Negate", "P1")
+            self.assertEqual(P(range(20)), [-(i ** 2) + 1 for i in range(20)])
+
+    def test_reuse_chart(self):
+        C = make_chart(square, increment)
+        P = flow.Pipe(C, process_mode="iterate", reuse_chart=True)
+        self.assertEqual(P(range(5)), [i ** 2 + 1 for i in range(5)])
+        chart = P._chart
+        self.assertEqual(P(range(5)), [i ** 2 + 1 for i in range(5)])
+        self.assertIs(P._chart, chart)
+        # the copy is replaced once the flowchart is edited
+        C.add_node(flow.Process(name="Negate", action=negate))
+        C.insert_node("Negate", "P1")
+        self.assertEqual(P(range(5)), [-(i ** 2) + 1 for i in range(5)])
+        self.assertEqual(P.paths[0], ["P0", "Negate", "P1", "End"])
+
+    def test_reuse_chart_parallelize(self):
+        with flow.Pipe(make_chart(square, increment), cores=2, reuse_chart=True) as P:
+            self.assertEqual(P(range(10)), [i ** 2 + 1 for i in range(10)])
+            self.assertEqual(P.paths, [["P0", "P1", "End"]] * 10)
+
+    def test_unknown_cpu_count(self):
+        with mock.patch("os.cpu_count", return_value=None):
+            P = flow.Pipe(make_chart(square))
+        self.assertEqual(P.cores, 1)
+        with P:
+            self.assertEqual(P(range(4)), [0, 1, 4, 9])
+
+    def test_close(self):
+        P = flow.Pipe(make_chart(square), cores=2)
+        self.assertEqual(P(range(4)), [0, 1, 4, 9])
+        pool = P._pool
+        self.assertIsNotNone(pool)
+        P.close()
+        self.assertIsNone(P._pool)
+        self.assertEqual(P(range(4)), [0, 1, 4, 9])
+        self.assertIsNot(P._pool, pool)
+        P.close()
+
+    def test_nested_pipe(self):
+        inner = flow.Pipe(make_chart(square), cores=2, name="inner")
+        outer = make_chart(list)
+        outer.add_node(inner)
+        outer.insert_node("inner", "P0")
+        self.assertEqual(outer(range(6)), [i ** 2 for i in range(6)])
+        # only a top level Pipe keeps its workers alive
+        self.assertIsNone(inner._pool)
+
+    def test_resources(self):
+        C = make_chart(square, increment)
+        C.nodes["P0"].resource = "gpu"
+        with flow.Pipe(C, cores=2, resources={"gpu": 1}) as P:
+            self.assertEqual(P(range(8)), [i ** 2 + 1 for i in range(8)])
+
+    def test_tagged_subchart(self):
+        # a tagged chart holding a node with the same tag must not deadlock
+        inner = make_chart(square, name="inner", resource="gpu")
+        inner.nodes["P0"].resource = "gpu"
+        outer = make_chart(increment)
+        outer.add_node(inner)
+        outer.insert_node("inner", "P0")
+        with flow.Pipe(outer, cores=2, resources={"gpu": 1}) as P:
+            self.assertEqual(P(range(8)), [i ** 2 + 1 for i in range(8)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+
+import context
+from context import flow
+from helpers import *
+
+_normalize_structure = flow.second_order_nodes._normalize_structure
+
+
+def forward(chart):
+    return dict((name, [F.name for F in node.forward]) for name, node in chart.nodes.items())
+
+def structure(chart):
+    return dict((name, list(links)) for name, links in chart.structure_dict.items())
+
+
+class TestNormalize(unittest.TestCase):
+
+    def test_list(self):
+        self.assertEqual(
+            _normalize_structure(["A", "B", "C"]),
+            [("A", "B"), ("B", "C")],
+        )
+
+    def test_list_tuples(self):
+        self.assertEqual(
+            _normalize_structure(["A", ("B", ["C", "End"]), "C", ("D", ("A",))]),
+            [("A", "B"), ("B", "C"), ("B", "End"), ("C", "D"), ("D", "A")],
+        )
+
+    def test_dict(self):
+        self.assertEqual(
+            _normalize_structure({"Start": "A", "A": ["B", "End"], "B": "End", "End": []}),
+            [("Start", "A"), ("A", "B"), ("A", "End"), ("B", "End")],
+        )
+
+
+class TestBuildChart(unittest.TestCase):
+    # the expected links are those built by build_chart before the
+    # structure was normalized into a list of links
+
+    def test_list(self):
+        C = flow.Chart(["Process", "Decision"])
+        expected = {"Process": ["Decision"], "Decision": ["End"], "Start": ["Process"], "End": []}
+        self.assertEqual(structure(C), expected)
+        self.assertEqual(forward(C), expected)
+
+    def test_named_list(self):
+        C = flow.Chart(["A:Process", "B:Process", "C:Process"])
+        expected = {"A": ["B"], "B": ["C"], "C": ["End"], "Start": ["A"], "End": []}
+        self.assertEqual(structure(C), expected)
+        self.assertEqual(forward(C), expected)
+        self.assertIsInstance(C.nodes["B"], flow.Process)
+
+    def test_list_tuple(self):
+        C = flow.Chart(["Process", ("Decision", ("Process", "End"))])
+        expected = {"Process": ["Decision"], "Decision": ["Process", "End"], "Start": ["Process"], "End": []}
+        self.assertEqual(structure(C), expected)
+        self.assertEqual(forward(C), expected)
+
+    def test_list_tuple_first(self):
+        C = flow.Chart([("Decision", ("Process", "End")), "Process"])
+        # End already has a link, so the last node is not linked to it
+        expected = {"Decision": ["Process", "End"], "Process": [], "Start": ["Decision"], "End": []}
+        self.assertEqual(structure(C), expected)
+        self.assertEqual(forward(C), expected)
+
+    def test_dict(self):
+        C = flow.Chart(
+            {"Start": "A", "A": ["B", "End"], "B": "End"},
+            {"A": {"node_class": "Decision"}, "B": {"node_class": "Process"}},
+        )
+        expected = {"Start": ["A"], "A": ["B", "End"], "B": ["End"], "End": []}
+        self.assertEqual(structure(C), expected)
+        self.assertEqual(forward(C), expected)
+        self.assertIsInstance(C.nodes["A"], flow.Decision)
+
+    def test_dict_lists(self):
+        C = flow.Chart(
+            {"Start": ["A"], "A": ["B", "C"], "B": "C", "C": ["End"]},
+            dict((name, {"node_class": "Process"}) for name in "ABC"),
+        )
+        expected = {"Start": ["A"], "A": ["B", "C"], "B": ["C"], "C": ["End"], "End": []}
+        self.assertEqual(structure(C), expected)
+        self.assertEqual(forward(C), expected)
+        self.assertEqual(list(node.name for node in C.nodes["C"].reverse), ["A", "B"])
+
+
+if __name__ == "__main__":
+    unittest.main()